@@ -19,18 +19,21 @@
 """bcms.py - Bassclef CMS"""
 
 import argparse
+import importlib
 
-from bassclef.test import test
-from bassclef.init import init
-from bassclef.make import make
-from bassclef.preprocess import preprocess
-from bassclef.postprocess import postprocess
-from bassclef.compose import compose
-from bassclef.feed import feed
-from bassclef.serve import serve
 from bassclef.util import write
 
 
+def getcommand(name):
+    """Returns the function for the named command.
+
+    The command's module is only imported here so that each invocation
+    loads just the one it needs.
+    """
+    module = importlib.import_module('bassclef.' + name)
+    return getattr(module, name)
+
+
 def main():
     """Main program."""
 
@@ -40,53 +43,54 @@ def main():
 
     # 'test'
     subparser = subparsers.add_parser('test')
-    subparser.set_defaults(func=test)
+    subparser.set_defaults(command='test')
 
     # 'init'
     subparser = subparsers.add_parser('init')
     subparser.add_argument('--force', '-f', action='store_true')
     subparser.add_argument('--extras', '-e', action='store_true')
-    subparser.set_defaults(func=init)
+    subparser.set_defaults(command='init')
 
     # 'make'
     subparser = subparsers.add_parser('make')
     subparser.add_argument('target', nargs='*', default='')
-    subparser.set_defaults(func=make)
+    subparser.set_defaults(command='make')
 
     # 'preprocess'
     subparser = subparsers.add_parser('preprocess')
     subparser.add_argument('path')
-    subparser.set_defaults(func=preprocess)
+    subparser.set_defaults(command='preprocess')
 
     # 'postprocess'
     subparser = subparsers.add_parser('postprocess')
-    subparser.set_defaults(func=postprocess)
+    subparser.set_defaults(command='postprocess')
 
     # 'compose'
     subparser = subparsers.add_parser('compose')
     subparser.add_argument('path')
-    subparser.set_defaults(func=compose)
+    subparser.set_defaults(command='compose')
 
     # 'feed'
     subparser = subparsers.add_parser('feed')
     subparser.add_argument('path')
-    subparser.set_defaults(func=feed)
+    subparser.set_defaults(command='feed')
 
     # 'serve'
     subparser = subparsers.add_parser('serve')
-    subparser.set_defaults(func=serve)
+    subparser.set_defaults(command='serve')
 
     # Parse the args and call whatever function was selected
     args, other_args = parser.parse_known_args()
-    if hasattr(args, 'func'):
-        if args.func.__name__ in ['make']:
-            args.func(args, other_args)
+    if hasattr(args, 'command'):
+        func = getcommand(args.command)
+        if args.command in ['make']:
+            func(args, other_args)
         elif other_args:
             write('Unknown options: ' + ' '.join(other_args) + '\n')
-        elif args.func.__name__ in ['test', 'postprocess', 'serve']:
-            args.func()
+        elif args.command in ['test', 'postprocess', 'serve']:
+            func()
         else:
-            args.func(args)
+            func(args)
     else:
         parser.print_help()
 
@@ -56,18 +56,19 @@ def process(lines, meta, n):
     for line in lines:
 
         # Use the number n to give links a namespace
-        while p1.search(line):
-            old, a, b = p1.search(line).groups()
+        m = p1.search(line)
+        while m:
+            old, a, b = m.groups()
             new = '[%s][%d:%s]'%(a, n, b)
             line = line.replace(old, new)
-        if p2.search(line):
-            a = p2.search(line).groups()[0]
+            m = p1.search(line)
+        m = p2.search(line)
+        if m:
+            a = m.groups()[0]
             line = p2.sub('[%d:%s]:'%(n, a), line)
 
         # Strip footnote references
-        if p3.search(line):
-            a = p3.search(line).groups()[0]
-            line = p3.sub('', line)
+        line = p3.sub('', line)
 
         # Check for a cut point
         if line.strip() == '<!-- cut -->':
@@ -20,168 +20,136 @@
 
 import re
 
-from bassclef.util import getconfig, writelines
+from bassclef.util import getconfig, write
 from bassclef.util import STDIN
 
 
-def fix_bugs(lines):
+# Regular expressions (compiled once at import)
+P_HEADER_NUM = re.compile(r'(<title>|<meta [^>]*?content="|<h1 [^>]*>)'
+                          r'(\d+)// ')
+P_P_COMMENT = re.compile(r'^([ \t]*)<p>(<!-- .* -->)</p>$', re.MULTILINE)
+P_IMG = re.compile(r'(<img src="(/[^"]*?)?/images/([^"]*)"[^>]*/>)')
+P_DIV_COMMENT = re.compile(r'^([ \t]*</div>[ \t]*)\n[ \t]*(<!--.*?)[ \t]*$',
+                           re.MULTILINE)
+P_SOCIAL = re.compile(r'<a href="([^"]*)"( [^>]*)?><span class="fa ([^"]*)">')
+
+# Social link tooltips, keyed by a string found in the link url
+TOOLTIPS = {'twitter': 'Tweet this',
+            'facebook': 'Share this on Facebook',
+            'google': 'Share this on Google+',
+            'linkedin': 'Share this on LinkedIn',
+            'mailto': 'Share this by Email'}
+P_TOOLTIP = re.compile('|'.join(TOOLTIPS))
+
+
+def fix_bugs(text):
     """Fixes bugs in pandoc's html output."""
 
     # Pandoc should not be treating numbers in headers as list items.  Here
     # we undo the temporary obfuscation made by preprocess.py's call to
-    # bassclef.util.getmeta().
-    p = re.compile(r'<title>(\d+)// (.*?)</title>')
-    for i, line in enumerate(lines):
-        if p.search(line):
-            num, title = p.search(line).groups()
-            lines[i] = '<title>%s. %s</title>' % (num, title)
-    p = re.compile(r'<meta (.*?) content="(\d+)// (.*?)" />')
-    for i, line in enumerate(lines):
-        if p.search(line):
-            attrs, num, title = p.search(line).groups()
-            lines[i] = '<meta %s content="%s. %s" />' % (attrs, num, title)
-    p = re.compile(r'(\s+)<h1 (.*?)>(\d+)// (.*?)</h1>')
-    for i, line in enumerate(lines):
-        if p.search(line):
-            spaces, attrs, num, title = p.search(line).groups()
-            lines[i] = '%s<h1 %s>%s. %s</h1>' % (spaces, attrs, num, title)
+    # bassclef.util.getmeta().  The title, meta and h1 tags are all fixed
+    # in one pass.  The '// ' marker is rare, so check for it first.
+    if '// ' in text:
+        text = P_HEADER_NUM.sub(r'\1\2. ', text)
 
     # Change <p><br /></p> to just <br />
-    for i, line in enumerate(lines):
-        lines[i] = line.replace('<p><br /></p>', '<br />\n')
+    text = text.replace('<p><br /></p>', '<br />\n')
 
     # Remove paragraph markers in head
-    flag = False
-    for i, line in enumerate(lines):
-        if flag or line.strip().startswith('<head>'):
-            flag = True
-            lines[i] = line.replace('<p>', '').replace('</p>', '')
-        if line.strip().startswith('</head>'):
-            break
+    start = text.find('<head>')
+    end = text.find('</head>', start)
+    if start != -1 and end != -1:
+        head = text[start:end].replace('<p>', '').replace('</p>', '')
+        text = text[:start] + head + text[end:]
 
     # Remove paragraph tags from around comments
-    p = re.compile(r'(^\s*)<p>(<!-- .* -->)</p>$')
-    for i, line in enumerate(lines):
-        if p.match(line):
-            space, comment = p.match(line).groups()
-            lines[i] = space + comment + '\n'
+    if '<p><!-- ' in text:
+        text = P_P_COMMENT.sub(r'\1\2', text)
 
-    return lines
+    return text
 
 
-def adjust_urls(lines):
+def adjust_urls(text):
     """Put web root into urls where appropriate."""
     webroot = getconfig('web-root')
     if webroot:
-        p = re.compile('((src|href)="/(.*?)")')
-        for i, line in enumerate(lines):
-            replace = False
-            for group in p.findall(line):
-                replace = True
-                old, tag, path = group
-                new = '%s="/%s/%s"' % (tag, webroot, path)
-                line = line.replace(old, new)
-            if replace:
-                lines[i] = line
-    return lines
-
-
-def link_images(lines):
+        for attr in ('src', 'href'):
+            text = text.replace('%s="/' % attr, '%s="/%s/' % (attr, webroot))
+    return text
+
+
+def link_images(text):
     """Link images to their full-size originals."""
-    p = re.compile('(<img src="(/.*?)?/images/(.*?)".*?/>)')
-    for i, line in enumerate(lines):
-        if p.search(line):
-            # If this is already linked, don't do it again
-            if line.strip().lower().endswith('</a>') or \
-              lines[i+1].strip().lower().startswith('</a>'):
-                continue
-            imgtag, root, subpath = p.search(line).groups()
-            # Don't link in originals
-            if subpath.startswith('originals/'):
-                continue
-            linked_imgtag = '<a href="%s/images/originals/%s">%s</a>' % \
-              (root or '', subpath, imgtag)
-            lines[i] = line.replace(imgtag, linked_imgtag)
-    return lines
-
-
-def open_tabs_when_clicked(lines):
-    """Makes clicking links open tabs (for select cases)."""
-
-    # Make social badge links open a new tab when clicked
-    p = re.compile(r'(<a href="([^"]*?)"><span class="fa (.*?)">)')
+
+    def link(m):
+        """Returns the linked image tag for match m."""
+        imgtag, root, subpath = m.groups()
+        # Don't link in originals
+        if subpath.startswith('originals/'):
+            return imgtag
+        return '<a href="%s/images/originals/%s">%s</a>' % \
+          (root or '', subpath, imgtag)
+
+    lines = text.split('\n')
     for i, line in enumerate(lines):
-        if p.search(line):
-            old, url, classes = p.search(line).groups()
-            new = '<a href="%s" target="_blank"><span class="fa %s">' \
-                  % (url, classes)
-            lines[i] = line.replace(old, new)
+        if '<img ' not in line:
+            continue
+        # If this is already linked, don't do it again
+        if line.rstrip().lower().endswith('</a>') or \
+          (i+1 < len(lines) and \
+           lines[i+1].lstrip().lower().startswith('</a>')):
+            continue
+        lines[i] = P_IMG.sub(link, line)
 
-    return lines
+    return '\n'.join(lines)
 
 
-def generate_tooltips(lines):
-    """Generates tooltips (for select cases)."""
+def enhance_social_links(text):
+    """Makes social badge links open new tabs and gives them tooltips."""
 
-    # Give social links a tooltip
-    p = re.compile(r'(<a href="([^"]*?)" (.*?)><span class="fa (.*?)">)')
-    for i, line in enumerate(lines):
-        if p.search(line):
-            old, url, attrs, classes = p.search(line).groups()
-
-            if 'twitter' in url:
-                title = 'Tweet this'
-            elif 'facebook' in url:
-                title = 'Share this on Facebook'
-            elif 'google' in url:
-                title = 'Share this on Google+'
-            elif 'linkedin' in url:
-                title = 'Share this on LinkedIn'
-            elif 'mailto' in url:
-                title = 'Share this by Email'
-            else:
-                continue
-            new = '<a href="%s" %s title="%s"><span class="fa %s">' \
-                  % (url, attrs, title, classes)
-
-            lines[i] = line.replace(old, new)
-
-    return lines
-
-
-def make_aesthetic_fixes(lines):
+    def enhance(m):
+        """Returns the enhanced social link for match m."""
+        url, attrs, classes = m.groups()
+
+        # Make plain social badge links open a new tab when clicked
+        if attrs is None:
+            attrs = ' target="_blank"'
+
+        # Give social links a tooltip
+        key = P_TOOLTIP.search(url)
+        if key:
+            attrs += ' title="%s"' % TOOLTIPS[key.group(0)]
+
+        return '<a href="%s"%s><span class="fa %s">' % (url, attrs, classes)
+
+    if 'class="fa ' not in text:
+        return text
+    return P_SOCIAL.sub(enhance, text)
+
+
+def make_aesthetic_fixes(text):
     """Html should look nice."""
 
     # Comments immediately after </div> tags should be on same line
-    for i in range(len(lines)-1):
-        if lines[i] is None:
-            continue
-        if lines[i].strip() == '</div>' and \
-          lines[i+1].strip().startswith('<!--'):
-            lines[i] = lines[i][:-1] + ' ' + lines[i+1].strip() + '\n'
-            lines[i+1] = None
-    lines = [line for line in lines if not line is None]
-
-    return lines
+    return P_DIV_COMMENT.sub(r'\1 \2', text)
 
 
 def postprocess():
     """Postprocesses html output piped to stdin from pandoc."""
 
-    # Get the lines
-    lines = [line for line in STDIN]
+    # Get the text
+    text = STDIN.read()
 
     # Essential fixes
-    lines = fix_bugs(lines)
-    lines = adjust_urls(lines)
+    text = fix_bugs(text)
+    text = adjust_urls(text)
 
     # Functionality enhancements
-    lines = link_images(lines)
-    lines = open_tabs_when_clicked(lines)
-    lines = generate_tooltips(lines)
+    text = link_images(text)
+    text = enhance_social_links(text)
 
     # Niceties
-    lines = make_aesthetic_fixes(lines)
+    text = make_aesthetic_fixes(text)
 
     # Write to stdout
-    writelines(lines)
+    write(text)
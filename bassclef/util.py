@@ -25,7 +25,6 @@ import sys
 import os
 import io
 import subprocess
-import copy
 
 import yaml
 
@@ -51,7 +50,7 @@ def getconfig(key=None):
 
     global CONFIG  # pylint: disable=global-statement
     if CONFIG:
-        return CONFIG[key] if key else copy.deepcopy(CONFIG)
+        return CONFIG[key] if key else CONFIG.copy()
 
     # Read the config.ini into a dict, discarding the section info
     config = {}
@@ -73,8 +72,9 @@ def getconfig(key=None):
     sanitycheck(config)
     CONFIG = config
 
-    # Return the config dict or a value if the key is given
-    return config[key] if key else copy.deepcopy(config)
+    # Return the config dict or a value if the key is given.  A shallow copy
+    # is enough because sanitycheck() has made every value a string.
+    return config[key] if key else config.copy()
 
 
 def getmeta(path, key=None):
@@ -187,8 +187,9 @@ def writemeta(meta, f=STDOUT, obfuscate=False):
             # up the html meta fields.  Make a temporary and unobtrusive
             # change that we can undo in the postprocessing.
             p = re.compile(r'^(\d+)\. (.*)')
-            if p.search(v):
-                v = '%s// %s' % p.search(v).groups()
+            m = p.search(v)
+            if m:
+                v = '%s// %s' % m.groups()
 
         if k in ['schemameta', 'ogmeta', 'cardmeta']:
             f.write('%s: >\n    %s\n' % (k, v.replace('\n', '\n    ')))